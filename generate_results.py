@@ -5,6 +5,10 @@ Generate Results CSV for TSP Project
 This script runs all three algorithms (BF, Approx, LS) on all datasets
 and generates a results.csv file with performance metrics.
 
+Each dataset's row is appended as soon as it finishes. Rerunning the script
+skips datasets already present in results.csv, so an interrupted run can be
+resumed; delete results.csv to start over.
+
 Usage:
     python generate_results.py
 
@@ -14,15 +18,25 @@ Requirements:
 """
 
 import os
+
+# Must be set before Numba is imported (via tsp_brute_force) to take effect
+os.environ.setdefault('NUMBA_CACHE_DIR', os.path.expanduser('~/.cache/tsp_numba'))
+
 import subprocess
 import time
 import csv
 import statistics
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import repeat
+import numpy as np
 from tsp_parser import parse_tsp_file
+from tsp_utils import build_distance_matrix
 import tsp_brute_force
 import tsp_approx
 import tsp_genetic
 
+CACHE_DIR = os.path.join('DATA', '.cache')
+
 
 def get_dataset_files(data_dir='DATA'):
     if not os.path.exists(data_dir):
@@ -33,15 +47,39 @@ def get_dataset_files(data_dir='DATA'):
     return sorted(files)
 
 
-def run_brute_force(instance_name, coordinates, cutoff_time=600):
+def load_distance_matrix(dataset, tsp_file, xs, ys, cache_dir=CACHE_DIR):
+    cache_path = os.path.join(cache_dir, f"{dataset}.npy")
+    # Reuse the cached matrix unless the .tsp file was modified after it was written
+    if (os.path.exists(cache_path)
+            and os.path.getmtime(cache_path) >= os.path.getmtime(tsp_file)):
+        try:
+            D = np.load(cache_path)
+            if D.shape == (len(xs), len(xs)):
+                return D
+        except (OSError, ValueError):
+            pass
+        # Unreadable or mismatched cache file; fall through and rewrite it
+    
+    D = build_distance_matrix(xs, ys)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write to a temporary file and rename it into place, so an interrupted
+    # run never leaves a truncated cache file behind
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, D)
+    os.replace(tmp_path, cache_path)
+    return D
+
+
+def run_brute_force(instance_name, D, cutoff_time=600):
     print(f"  Running Brute Force (cutoff: {cutoff_time}s)...")
     start_time = time.time()
     
-    best_tour, best_distance = tsp_brute_force.solve_tsp(coordinates, cutoff_time)
+    best_tour, best_distance = tsp_brute_force.solve_tsp(D, cutoff_time)
     
     elapsed_time = time.time() - start_time
     
-    full_tour = 'Yes' if best_tour and len(best_tour) == len(coordinates) else 'No'
+    full_tour = 'Yes' if best_tour and len(best_tour) == len(D) else 'No'
     
     return {
         'time': round(elapsed_time, 2),
@@ -50,11 +88,11 @@ def run_brute_force(instance_name, coordinates, cutoff_time=600):
     }
 
 
-def run_approx(instance_name, coordinates):
+def run_approx(instance_name, D):
     print(f"  Running Approximation...")
     start_time = time.time()
     
-    best_tour, best_distance = tsp_approx.solve_tsp(coordinates)
+    best_tour, best_distance = tsp_approx.solve_tsp(D)
     
     elapsed_time = time.time() - start_time
     
@@ -64,23 +102,32 @@ def run_approx(instance_name, coordinates):
     }
 
 
-def run_local_search(instance_name, coordinates, cutoff_time=600, num_runs=10):
+def _run_one_seed(D, cutoff_time, seed):
+    start_time = time.time()
+    
+    best_tour, best_distance = tsp_genetic.solve_tsp(D, cutoff_time, seed)
+    
+    elapsed_time = time.time() - start_time
+    return elapsed_time, best_distance
+
+
+def run_local_search(instance_name, D, cutoff_time=600, num_runs=10, max_workers=None):
     print(f"  Running Local Search {num_runs} times (cutoff: {cutoff_time}s)...")
     
     times = []
     qualities = []
     
-    for seed in range(num_runs):
-        print(f"    Run {seed+1}/{num_runs} (seed={seed})...", end=' ')
-        start_time = time.time()
+    # Seeds are independent, so run them in parallel; each keeps its own cutoff
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        futures = {pool.submit(_run_one_seed, D, cutoff_time, seed): seed for seed in range(num_runs)}
         
-        best_tour, best_distance = tsp_genetic.solve_tsp(coordinates, cutoff_time, seed)
-        
-        elapsed_time = time.time() - start_time
-        times.append(elapsed_time)
-        qualities.append(best_distance)
-        
-        print(f"Quality: {best_distance:.2f}, Time: {elapsed_time:.2f}s")
+        for future in as_completed(futures):
+            seed = futures[future]
+            elapsed_time, best_distance = future.result()
+            times.append(elapsed_time)
+            qualities.append(best_distance)
+            
+            print(f"    Run {len(qualities)}/{num_runs} (seed={seed}) Quality: {best_distance:.2f}, Time: {elapsed_time:.2f}s")
     
     return {
         'avg_time': round(statistics.mean(times), 2),
@@ -97,67 +144,83 @@ def calculate_relative_error(quality, best_quality):
     return round(rel_error, 5)
 
 
-def generate_results_csv(datasets, bf_cutoff=600, ls_cutoff=600, ls_runs=10):
-    results = []
+def process_dataset(dataset, bf_cutoff=600, ls_cutoff=600, ls_runs=10, ls_workers=None):
+    print(f"\nProcessing {dataset}...")
     
-    for dataset in datasets:
-        print(f"\nProcessing {dataset}...")
-        
-        tsp_file = os.path.join('DATA', f"{dataset}.tsp")
-        try:
-            instance_name, dimension, coordinates = parse_tsp_file(tsp_file)
-            print(f"  Loaded: {dimension} cities")
-        except Exception as e:
-            print(f"  Error loading {dataset}: {e}")
-            continue
-        
-        row = {'Dataset': dataset}
+    tsp_file = os.path.join('DATA', f"{dataset}.tsp")
+    try:
+        instance_name, dimension, xs, ys, id_map = parse_tsp_file(tsp_file)
+        D = load_distance_matrix(dataset, tsp_file, xs, ys)
+        print(f"  Loaded: {dimension} cities")
+    except Exception as e:
+        print(f"  Error loading {dataset}: {e}")
+        return None
+    
+    row = {'Dataset': dataset}
 
-        try:
-            bf_results = run_brute_force(dataset, coordinates, bf_cutoff)
-            row['BF_Time'] = bf_results['time']
-            row['BF_Quality'] = bf_results['quality']
-            row['BF_FullTour'] = bf_results['full_tour']
-        except Exception as e:
-            print(f"  Error in Brute Force: {e}")
-            row['BF_Time'] = 'Error'
-            row['BF_Quality'] = 'Error'
-            row['BF_FullTour'] = 'No'
+    try:
+        bf_results = run_brute_force(dataset, D, bf_cutoff)
+        row['BF_Time'] = bf_results['time']
+        row['BF_Quality'] = bf_results['quality']
+        row['BF_FullTour'] = bf_results['full_tour']
+    except Exception as e:
+        print(f"  Error in Brute Force: {e}")
+        row['BF_Time'] = 'Error'
+        row['BF_Quality'] = 'Error'
+        row['BF_FullTour'] = 'No'
 
-        try:
-            approx_results = run_approx(dataset, coordinates)
-            row['Approx_Time'] = approx_results['time']
-            row['Approx_Quality'] = approx_results['quality']
-        except Exception as e:
-            print(f"  Error in Approximation: {e}")
-            row['Approx_Time'] = 'Error'
-            row['Approx_Quality'] = 'Error'
-        
-        try:
-            ls_results = run_local_search(dataset, coordinates, ls_cutoff, ls_runs)
-            row['LS_Time'] = ls_results['avg_time']
-            row['LS_Quality'] = ls_results['avg_quality']
-            best_quality = ls_results['best_quality']
-        except Exception as e:
-            print(f"  Error in Local Search: {e}")
-            row['LS_Time'] = 'Error'
-            row['LS_Quality'] = 'Error'
-            best_quality = float('inf')
-        
-        if isinstance(row['Approx_Quality'], (int, float)) and best_quality != float('inf'):
-            row['Approx_RelError'] = calculate_relative_error(row['Approx_Quality'], best_quality)
-        else:
-            row['Approx_RelError'] = 'N/A'
-        
-        if isinstance(row['LS_Quality'], (int, float)) and best_quality != float('inf'):
-            row['LS_RelError'] = calculate_relative_error(row['LS_Quality'], best_quality)
-        else:
-            row['LS_RelError'] = 'N/A'
-        
-        results.append(row)
-        print(f"  Completed {dataset}")
+    try:
+        approx_results = run_approx(dataset, D)
+        row['Approx_Time'] = approx_results['time']
+        row['Approx_Quality'] = approx_results['quality']
+    except Exception as e:
+        print(f"  Error in Approximation: {e}")
+        row['Approx_Time'] = 'Error'
+        row['Approx_Quality'] = 'Error'
+    
+    try:
+        ls_results = run_local_search(dataset, D, ls_cutoff, ls_runs, ls_workers)
+        row['LS_Time'] = ls_results['avg_time']
+        row['LS_Quality'] = ls_results['avg_quality']
+        best_quality = ls_results['best_quality']
+    except Exception as e:
+        print(f"  Error in Local Search: {e}")
+        row['LS_Time'] = 'Error'
+        row['LS_Quality'] = 'Error'
+        best_quality = float('inf')
+    
+    if isinstance(row['Approx_Quality'], (int, float)) and best_quality != float('inf'):
+        row['Approx_RelError'] = calculate_relative_error(row['Approx_Quality'], best_quality)
+    else:
+        row['Approx_RelError'] = 'N/A'
+    
+    if isinstance(row['LS_Quality'], (int, float)) and best_quality != float('inf'):
+        row['LS_RelError'] = calculate_relative_error(row['LS_Quality'], best_quality)
+    else:
+        row['LS_RelError'] = 'N/A'
+    
+    print(f"  Completed {dataset}")
+    return row
+
+
+def read_completed_datasets(csv_file, header):
+    if not os.path.exists(csv_file):
+        return set()
     
-    csv_file = 'results.csv'
+    with open(csv_file, newline='') as f:
+        rows = list(csv.reader(f))
+    
+    if not rows:
+        return set()
+    # A file written with a different column layout cannot be resumed
+    if len(rows) < 2 or rows[1] != header:
+        return None
+    
+    # Skip the two header rows; the first cell of each data row is the dataset
+    return {row[0] for row in rows[2:] if row}
+
+
+def generate_results_csv(datasets, bf_cutoff=600, ls_cutoff=600, ls_runs=10, csv_file='results.csv'):
     fieldnames = [
         'Dataset',
         'BF_Time', 'BF_Quality', 'BF_FullTour',
@@ -172,18 +235,59 @@ def generate_results_csv(datasets, bf_cutoff=600, ls_cutoff=600, ls_runs=10):
         'Time(s)', 'Sol.Quality', 'RelError'
     ]
     
-    with open(csv_file, 'w', newline='') as f:
-        f.write(',Brute Force,,,Approx,,,Local Search,,\n')
-        f.write(','.join(formatted_fieldnames) + '\n')
+    # Resume an interrupted run by skipping datasets already in the CSV
+    completed = read_completed_datasets(csv_file, formatted_fieldnames)
+    if completed is None:
+        # Never overwrite an earlier backup; number later ones instead
+        backup_file = f"{csv_file}.bak"
+        counter = 1
+        while os.path.exists(backup_file):
+            backup_file = f"{csv_file}.bak.{counter}"
+            counter += 1
+        os.replace(csv_file, backup_file)
+        print(f"{csv_file} has a different column layout; moved it to {backup_file} and starting fresh")
+        completed = set()
+    
+    skipped = set(datasets) & completed
+    if skipped:
+        print(f"Skipping {len(skipped)} dataset(s) already in {csv_file} "
+              f"(their rows keep the cutoffs and run count they were generated with; "
+              f"delete {csv_file} to regenerate them)")
+    datasets = [dataset for dataset in datasets if dataset not in completed]
+    
+    if not datasets:
+        print(f"All datasets are already in {csv_file}; nothing to run")
+        return
+    
+    # Split the cores between datasets and the LS seeds within each dataset
+    cpu_count = os.cpu_count() or 1
+    ls_workers = max(1, min(ls_runs, cpu_count))
+    dataset_workers = max(1, cpu_count // ls_workers)
+    
+    # Compile the BF kernels once up front so no dataset's BF time includes
+    # JIT compilation; workers then load them from the on-disk cache
+    print("Compiling solver kernels...")
+    tsp_brute_force.warmup()
+    
+    with open(csv_file, 'a', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        if f.tell() == 0:
+            writer.writerow(['', 'Brute Force', '', '', 'Approx', '', '', 'Local Search', '', ''])
+            writer.writerow(formatted_fieldnames)
         
-        for row in results:
-            data_row = [
-                row['Dataset'],
-                row['BF_Time'], row['BF_Quality'], row['BF_FullTour'],
-                row['Approx_Time'], row['Approx_Quality'], row['Approx_RelError'],
-                row['LS_Time'], row['LS_Quality'], row['LS_RelError']
-            ]
-            f.write(','.join(str(x) for x in data_row) + '\n')
+        # Datasets share no state; map() keeps the rows in dataset order
+        with ProcessPoolExecutor(max_workers=dataset_workers,
+                                 initializer=tsp_brute_force.warmup) as pool:
+            rows = pool.map(process_dataset, datasets, repeat(bf_cutoff),
+                            repeat(ls_cutoff), repeat(ls_runs), repeat(ls_workers))
+            
+            # Write each row as soon as it is ready so a crash loses no finished work
+            for row in rows:
+                if row is None:
+                    continue
+                writer.writerow([row[name] for name in fieldnames])
+                f.flush()
+                os.fsync(f.fileno())
     
     print(f"\n{'='*60}")
     print(f"Results saved to {csv_file}")
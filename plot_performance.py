@@ -9,63 +9,41 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 
+# Column layouts written by generate_results.py: the current one, and the
+# older one with Full Tour columns for Approx and LS as well
+RESULT_COLUMNS = {
+    10: ['Dataset', 'BF_Time', 'BF_Quality', 'BF_FullTour',
+         'Approx_Time', 'Approx_Quality', 'Approx_RelError',
+         'LS_Time', 'LS_Quality', 'LS_RelError'],
+    12: ['Dataset', 'BF_Time', 'BF_Quality', 'BF_FullTour',
+         'Approx_Time', 'Approx_Quality', 'Approx_RelError', 'Approx_FullTour',
+         'LS_Time', 'LS_Quality', 'LS_RelError', 'LS_FullTour'],
+}
+
+
 def load_results(csv_file='results.csv'):
-    df = pd.read_csv(csv_file, skiprows=1)
-    df.columns = ['Dataset', 'BF_Time', 'BF_Quality', 'BF_FullTour',
-                  'Approx_Time', 'Approx_Quality', 'Approx_RelError', 'Approx_FullTour',
-                  'LS_Time', 'LS_Quality', 'LS_RelError', 'LS_FullTour']
+    # 'Error' / 'N/A' cells become NaN, so numeric columns parse as floats in C
+    df = pd.read_csv(csv_file, skiprows=1, na_values=['Error', 'N/A'],
+                     dtype={'Dataset': str}, engine='c')
+    if len(df.columns) not in RESULT_COLUMNS:
+        raise ValueError(f"Unexpected column layout in {csv_file}: {len(df.columns)} columns")
+    df.columns = RESULT_COLUMNS[len(df.columns)]
     return df
 
 
-def normalize_quality(row):
-    qualities = []
-    
-    try:
-        bf_quality = float(row['BF_Quality'])
-        qualities.append(bf_quality)
-    except (ValueError, TypeError):
-        bf_quality = None
-    
-    try:
-        approx_quality = float(row['Approx_Quality'])
-        qualities.append(approx_quality)
-    except (ValueError, TypeError):
-        approx_quality = None
-    
-    try:
-        ls_quality = float(row['LS_Quality'])
-        qualities.append(ls_quality)
-    except (ValueError, TypeError):
-        ls_quality = None
+def normalize_quality(df):
+    qualities = df[['BF_Quality', 'Approx_Quality', 'LS_Quality']].apply(pd.to_numeric, errors='coerce')
+    best_quality = qualities.min(axis=1)
     
-    valid_qualities = [q for q in qualities if q is not None]
-    if not valid_qualities:
-        return None, None, None, None
+    normalized = qualities.div(best_quality, axis=0)
+    normalized.columns = ['BF', 'Approx', 'LS']
     
-    best_quality = min(valid_qualities)
-    
-    normalized_bf = bf_quality / best_quality if bf_quality is not None else None
-    normalized_approx = approx_quality / best_quality if approx_quality is not None else None
-    normalized_ls = ls_quality / best_quality if ls_quality is not None else None
-    
-    return normalized_bf, normalized_approx, normalized_ls, best_quality
+    norm_df = pd.concat([df['Dataset'], normalized], axis=1)
+    return norm_df[best_quality.notna()].reset_index(drop=True)
 
 
 def create_bar_chart(df, output_file='performance_chart.png'):
-    normalized_data = []
-    
-    for _, row in df.iterrows():
-        norm_bf, norm_approx, norm_ls, best_quality = normalize_quality(row)
-        
-        if best_quality is not None:
-            normalized_data.append({
-                'Dataset': row['Dataset'],
-                'BF': norm_bf,
-                'Approx': norm_approx,
-                'LS': norm_ls
-            })
-    
-    norm_df = pd.DataFrame(normalized_data)
+    norm_df = normalize_quality(df)
     
     fig, ax = plt.subplots(figsize=(14, 6))
     
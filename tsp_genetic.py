@@ -27,12 +27,12 @@ def initialize_population(vertices, population_size, seed):
     Initialize a population of random TSP routes.
     
     Args:
-        vertices: List of vertex IDs
+        vertices: List of vertex indices
         population_size: Number of individuals in population
         seed: Random seed for reproducibility
         
     Returns:
-        list: Population of random tours (each is a list of vertex IDs)
+        list: Population of random tours (each is a list of vertex indices)
     """
     random.seed(seed)
     population = []
@@ -46,14 +46,14 @@ def initialize_population(vertices, population_size, seed):
     return population
 
 
-def calculate_fitness(population, coordinates):
+def calculate_fitness(population, D):
     """
     Calculate fitness for each route in the population.
     Fitness is the inverse of tour length (shorter tours = higher fitness).
     
     Args:
-        population: List of tours (each is a list of vertex IDs)
-        coordinates: Dictionary mapping vertex_id -> (x, y)
+        population: List of tours (each is a list of vertex indices)
+        D: (n, n) distance matrix from build_distance_matrix
         
     Returns:
         tuple: (fitness_array, distances_array, best_tour, best_distance)
@@ -66,7 +66,7 @@ def calculate_fitness(population, coordinates):
     fitness = []
     
     for tour in population:
-        distance = calculate_tour_distance(tour, coordinates)
+        distance = calculate_tour_distance(tour, D)
         distances.append(distance)
         # Fitness is inverse of distance (avoid division by zero)
         fitness.append(1.0 / (distance + 1e-10))
@@ -137,8 +137,8 @@ def crossover(parent1, parent2):
     in order from parent2, skipping cities already used.
     
     Args:
-        parent1: First parent tour (list of vertex IDs)
-        parent2: Second parent tour (list of vertex IDs)
+        parent1: First parent tour (list of vertex indices)
+        parent2: Second parent tour (list of vertex indices)
         
     Returns:
         list: Child tour
@@ -178,7 +178,7 @@ def mutate(tour, mutation_probability):
     Mutate a tour by swapping two randomly chosen cities with given probability.
     
     Args:
-        tour: Tour to potentially mutate (list of vertex IDs)
+        tour: Tour to potentially mutate (list of vertex indices)
         mutation_probability: Probability of mutation (0.0 to 1.0)
         
     Returns:
@@ -212,23 +212,21 @@ def apply_elitism(population, distances, num_elite):
     return elite
 
 
-def solve_tsp(coordinates, cutoff_time, seed):
+def solve_tsp(D, cutoff_time, seed):
     """
     Solve TSP using genetic algorithm.
     
     Args:
-        coordinates: Dictionary mapping vertex_id -> (x, y)
+        D: (n, n) distance matrix from build_distance_matrix
         cutoff_time: Maximum time in seconds to run
         seed: Random seed for reproducibility
         
     Returns:
         tuple: (best_tour, best_distance)
+        best_tour is a list of vertex indices 0..n-1
     """
-    if not coordinates:
-        return [], 0.0
-    
-    vertices = sorted(coordinates.keys())
-    n = len(vertices)
+    n = len(D)
+    vertices = list(range(n))
     
     if n == 0:
         return [], 0.0
@@ -267,7 +265,7 @@ def solve_tsp(coordinates, cutoff_time, seed):
             break
         
         # Calculate fitness
-        fitness, distances, best_tour, best_distance = calculate_fitness(population, coordinates)
+        fitness, distances, best_tour, best_distance = calculate_fitness(population, D)
         
         # Update global best
         if best_distance < global_best_distance:
@@ -307,7 +305,7 @@ def solve_tsp(coordinates, cutoff_time, seed):
     
     if global_best_tour is None:
         # Fallback: return best from final population
-        _, distances, best_tour, best_distance = calculate_fitness(population, coordinates)
+        _, distances, best_tour, best_distance = calculate_fitness(population, D)
         return best_tour, best_distance
     
     print(f"Final best distance: {global_best_distance:.2f} (found in {generation} generations)")
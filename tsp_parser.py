@@ -8,8 +8,14 @@ The parser reads standard TSPLIB format files and extracts:
 - Instance name
 - Dimension (number of cities)
 - Node coordinates (vertex IDs and their x, y coordinates)
+
+Coordinates are returned as contiguous NumPy arrays (one for x, one for y)
+ordered by vertex ID, so city i in every solver is simply index i.
 """
 
+import io
+import numpy as np
+
 
 def parse_tsp_file(filename):
     """
@@ -19,45 +25,45 @@ def parse_tsp_file(filename):
         filename: Path to the .tsp file
         
     Returns:
-        tuple: (instance_name, dimension, coordinates_dict)
-        coordinates_dict maps vertex_id -> (x, y)
+        tuple: (instance_name, dimension, xs, ys, id_map)
+        xs, ys are float64 arrays of city coordinates sorted by vertex ID;
+        id_map is an int32 array mapping index i -> vertex ID
         
     Raises:
         ValueError: If the file format is invalid or required information is missing
     """
-    coordinates = {}
     instance_name = None
     dimension = None
     
-    with open(filename, 'r') as f:
-        in_coord_section = False
-        
-        for line in f:
-            line = line.strip()
-            
-            if not line or line == 'EOF':
-                if in_coord_section:
-                    break
-                continue
-            
-            if line.startswith('NAME:'):
-                instance_name = line.split(':', 1)[1].strip()
-            elif line.startswith('DIMENSION:'):
-                dimension = int(line.split(':', 1)[1].strip())
-            elif line == 'NODE_COORD_SECTION':
-                in_coord_section = True
-                continue
-            
-            if in_coord_section:
-                parts = line.split()
-                if len(parts) >= 3:
-                    vertex_id = int(parts[0])
-                    x = float(parts[1])
-                    y = float(parts[2])
-                    coordinates[vertex_id] = (x, y)
-    
-    if instance_name is None or dimension is None or not coordinates:
+    with open(filename, 'rb') as f:
+        data = f.read()
+    
+    # Split once into the header and the numeric coordinate block
+    header, found, body = data.partition(b'NODE_COORD_SECTION')
+    body = body.split(b'EOF', 1)[0]
+    
+    for line in header.splitlines():
+        key, sep, value = line.partition(b':')
+        if not sep:
+            continue
+        key = key.strip()
+        if key == b'NAME':
+            instance_name = value.strip().decode()
+        elif key == b'DIMENSION':
+            dimension = int(value)
+    
+    if instance_name is None or dimension is None or not found or not body.strip():
         raise ValueError(f"Invalid TSP file format: {filename}")
     
-    return instance_name, dimension, coordinates
-
+    # Parse all "id x y" rows in one pass
+    try:
+        coords = np.loadtxt(io.BytesIO(body), dtype=np.float64, usecols=(0, 1, 2), ndmin=2)
+    except ValueError:
+        raise ValueError(f"Invalid TSP file format: {filename}")
+    
+    order = np.argsort(coords[:, 0], kind='stable')
+    id_map = coords[order, 0].astype(np.int32)
+    xs = np.ascontiguousarray(coords[order, 1])
+    ys = np.ascontiguousarray(coords[order, 2])
+    
+    return instance_name, dimension, xs, ys, id_map
@@ -27,12 +27,13 @@ import sys
 import os
 import argparse
 from tsp_parser import parse_tsp_file
+from tsp_utils import build_distance_matrix
 import tsp_brute_force
 import tsp_approx
 import tsp_genetic
 
 
-def write_solution_file(instance_name, method, cutoff_time, seed, best_tour, best_distance):
+def write_solution_file(instance_name, method, cutoff_time, seed, best_tour, best_distance, id_map=None):
     """
     Write solution to output file in the specified format.
     
@@ -41,8 +42,9 @@ def write_solution_file(instance_name, method, cutoff_time, seed, best_tour, bes
         method: Algorithm method (e.g., "BF", "Approx")
         cutoff_time: Cutoff time used (int or float)
         seed: Random seed (optional, None if not used)
-        best_tour: List of vertex IDs in the tour
+        best_tour: List of vertex indices in the tour (vertex IDs if id_map is None)
         best_distance: Total distance of the tour
+        id_map: Optional array mapping vertex index -> vertex ID
     """
     instance_lower = instance_name.lower()
     
@@ -72,6 +74,8 @@ def write_solution_file(instance_name, method, cutoff_time, seed, best_tour, bes
         f.write(f"{best_distance:.2f}\n")
         
         # Line 2: Comma-separated vertex IDs
+        if id_map is not None:
+            best_tour = id_map[best_tour]
         tour_str = ", ".join(str(vertex) for vertex in best_tour)
         f.write(f"{tour_str}\n")
     
@@ -107,28 +111,34 @@ def main():
     
     try:
         # Parse TSP file
-        instance_name, dimension, coordinates = parse_tsp_file(tsp_file)
+        instance_name, dimension, xs, ys, id_map = parse_tsp_file(tsp_file)
         print(f"Loaded instance: {instance_name} ({dimension} cities)")
         
+        # Solvers work on matrix indices 0..n-1; id_map translates them back
+        # to vertex IDs only for output
+        D = build_distance_matrix(xs, ys)
+        
         best_tour = None
         best_distance = 0.0
         
         # Route to appropriate algorithm
         if args.alg == 'BF':
             print(f"Running Brute Force algorithm (cutoff: {args.time}s)...")
-            best_tour, best_distance = tsp_brute_force.solve_tsp(coordinates, args.time)
+            # Compile (or load) the kernels before the timed search starts
+            tsp_brute_force.warmup()
+            best_tour, best_distance = tsp_brute_force.solve_tsp(D, args.time)
             
         elif args.alg == 'Approx':
             print(f"Running Approximation algorithm...")
             # Approx ignores cutoff time in this implementation
-            best_tour, best_distance = tsp_approx.solve_tsp(coordinates, args.time)
+            best_tour, best_distance = tsp_approx.solve_tsp(D, args.time)
             
         elif args.alg == 'LS':
             if args.seed is None:
                 print("Error: Seed parameter is required for LS method.")
                 sys.exit(1)
             print(f"Running Genetic Algorithm / Local Search (cutoff: {args.time}s, seed: {args.seed})...")
-            best_tour, best_distance = tsp_genetic.solve_tsp(coordinates, args.time, args.seed)
+            best_tour, best_distance = tsp_genetic.solve_tsp(D, args.time, args.seed)
             
         if best_tour is None:
             print("Error: No solution found.")
@@ -137,14 +147,14 @@ def main():
         print(f"Best tour distance: {best_distance:.2f}")
         # Print first few and last few cities if tour is long
         if len(best_tour) > 20:
-            tour_preview = " -> ".join(str(v) for v in best_tour[:5]) + " ... " + " -> ".join(str(v) for v in best_tour[-5:])
+            tour_preview = " -> ".join(str(v) for v in id_map[best_tour[:5]]) + " ... " + " -> ".join(str(v) for v in id_map[best_tour[-5:]])
         else:
-            tour_preview = " -> ".join(str(v) for v in best_tour)
-        print(f"Tour: {tour_preview} -> {best_tour[0]}")
+            tour_preview = " -> ".join(str(v) for v in id_map[best_tour])
+        print(f"Tour: {tour_preview} -> {id_map[best_tour[0]]}")
         
-        # Write solution file
+        # Write solution file (translates indices back to vertex IDs)
         write_solution_file(args.inst, args.alg, args.time, args.seed, 
-                          best_tour, best_distance)
+                          best_tour, best_distance, id_map)
         
     except Exception as e:
         print(f"Error: {str(e)}")
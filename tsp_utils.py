@@ -6,6 +6,12 @@ for the Traveling Salesman Problem.
 """
 
 import math
+import numpy as np
+
+try:
+    from scipy.spatial.distance import pdist, squareform
+except ImportError:
+    pdist = None
 
 
 def euclidean_distance(coord1, coord2):
@@ -19,19 +25,43 @@ def euclidean_distance(coord1, coord2):
     Returns:
         float: Euclidean distance
     """
-    x1, y1 = coord1
-    x2, y2 = coord2
-    distance = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+    distance = math.hypot(coord2[0] - coord1[0], coord2[1] - coord1[1])
     return round(distance)
 
 
-def calculate_tour_distance(tour, coordinates):
+def build_distance_matrix(xs, ys):
+    """
+    Build the dense matrix of pairwise distances between all cities.
+    
+    Args:
+        xs: Array of x coordinates, one per city
+        ys: Array of y coordinates, one per city
+        
+    Returns:
+        numpy.ndarray: (n, n) float32 matrix of rounded Euclidean distances
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    
+    if pdist is not None and len(xs) > 0:
+        # pdist only computes the n(n-1)/2 pairs above the diagonal;
+        # squareform mirrors them into the symmetric matrix
+        condensed = np.rint(pdist(np.column_stack((xs, ys)))).astype(np.float32)
+        return squareform(condensed, checks=False)
+    
+    # Without SciPy, broadcast all pairwise differences in one vectorized pass
+    dx = xs[:, None] - xs[None, :]
+    dy = ys[:, None] - ys[None, :]
+    return np.rint(np.hypot(dx, dy)).astype(np.float32)
+
+
+def calculate_tour_distance(tour, D):
     """
     Calculate total distance of a TSP tour.
     
     Args:
-        tour: List of vertex IDs in order
-        coordinates: Dictionary mapping vertex_id -> (x, y)
+        tour: Sequence (list or int32 array) of vertex indices in order
+        D: (n, n) distance matrix from build_distance_matrix
         
     Returns:
         float: Total tour distance
@@ -39,20 +69,9 @@ def calculate_tour_distance(tour, coordinates):
     if len(tour) < 2:
         return 0.0
     
-    total_distance = 0.0
-    
-    # Distance between consecutive cities
-    for i in range(len(tour) - 1):
-        total_distance += euclidean_distance(
-            coordinates[tour[i]],
-            coordinates[tour[i + 1]]
-        )
+    tour = np.asarray(tour)
     
-    # Distance from last city back to first
-    total_distance += euclidean_distance(
-        coordinates[tour[-1]],
-        coordinates[tour[0]]
-    )
+    # Gather consecutive edges in one vectorized lookup, then close the cycle
+    total_distance = D[tour[:-1], tour[1:]].sum(dtype=np.float64) + D[tour[-1], tour[0]]
     
-    return total_distance
-
+    return float(total_distance)